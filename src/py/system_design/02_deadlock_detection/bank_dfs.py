@@ -1,7 +1,9 @@
 import threading
 import time
-from typing import Dict, List, Set
-from collections import defaultdict
+from typing import Deque, Dict, List, Set
+from collections import defaultdict, deque
+
+DEADLOCK_TIMEOUT = 0.1  # Seconds to wait on a lock before running deadlock detection
 
 class DeadlockDetectedException(Exception):
     pass
@@ -13,39 +15,76 @@ class Bank:
         self.locks: Dict[int, threading.Lock] = {acc: threading.Lock() for acc in accounts}
         self.wait_graph: Dict[int, Set[int]] = defaultdict(set)  # Thread ID -> Set of thread IDs it waits for
         self.lock_graph_lock = threading.Lock()  # Protects wait_graph
+        # Account ID -> thread ID holding its lock; single dict ops are atomic under the GIL
+        self.lock_owner: Dict[int, int] = {}
+        # Reusable BFS buffers, only touched under lock_graph_lock
+        self._bfs_frontier: Deque[int] = deque()
+        self._bfs_visited: Set[int] = set()
 
-    def _detect_cycle(self, thread_id: int, visited: Set[int], rec_stack: Set[int]) -> bool:
-        """Detect cycles in wait-for graph using DFS."""
-        visited.add(thread_id)
-        rec_stack.add(thread_id)
-        
-        for neighbor in self.wait_graph[thread_id]:
-            if neighbor not in visited:
-                if self._detect_cycle(neighbor, visited, rec_stack):
+    def _add_edge(self, from_thread_id: int, to_thread_id: int) -> None:
+        """Record that from_thread_id waits for to_thread_id (caller holds lock_graph_lock)."""
+        self.wait_graph[from_thread_id].add(to_thread_id)
+
+    def _remove_edge(self, from_thread_id: int, to_thread_id: int) -> None:
+        """Drop a wait-for edge, pruning empty entries (caller holds lock_graph_lock)."""
+        targets = self.wait_graph.get(from_thread_id)
+        if targets is not None:
+            targets.discard(to_thread_id)
+            if not targets:
+                del self.wait_graph[from_thread_id]
+
+    def _clear_waits(self, thread_id: int) -> None:
+        """Remove every outgoing wait-for edge of thread_id."""
+        # Only thread_id adds its own out-edges, so an unlocked miss is safe
+        if thread_id not in self.wait_graph:
+            return
+        with self.lock_graph_lock:
+            for target_thread_id in list(self.wait_graph.get(thread_id, ())):
+                self._remove_edge(thread_id, target_thread_id)
+
+    def _path_exists(self, src_thread_id: int, dst_thread_id: int) -> bool:
+        """Iterative BFS over the forward edges: can src reach dst in the wait-for graph?"""
+        if src_thread_id == dst_thread_id:
+            return True
+        frontier = self._bfs_frontier
+        visited = self._bfs_visited
+        frontier.clear()
+        visited.clear()
+        frontier.append(src_thread_id)
+        visited.add(src_thread_id)
+        while frontier:
+            thread_id = frontier.popleft()
+            for neighbor in self.wait_graph.get(thread_id, ()):
+                if neighbor == dst_thread_id:
                     return True
-            elif neighbor in rec_stack:
-                return True
-        
-        rec_stack.remove(thread_id)
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    frontier.append(neighbor)
         return False
 
     def _check_deadlock(self, current_thread_id: int, target_thread_id: int) -> bool:
-        """Check if adding an edge to wait-for graph causes a deadlock."""
+        """Check if adding an edge to wait-for graph causes a deadlock.
+
+        current -> target closes a cycle iff target can already reach current,
+        so a single BFS answers it without tentatively inserting the edge.
+        """
         with self.lock_graph_lock:
-            # Add edge to wait-for graph
-            self.wait_graph[current_thread_id].add(target_thread_id)
-            
-            # Check for cycle
-            visited: Set[int] = set()
-            rec_stack: Set[int] = set()
-            cycle_exists = self._detect_cycle(current_thread_id, visited, rec_stack)
-            
-            # Remove edge after checking
-            self.wait_graph[current_thread_id].discard(target_thread_id)
-            if not self.wait_graph[current_thread_id]:
-                del self.wait_graph[current_thread_id]
-            
-            return cycle_exists
+            if self._path_exists(target_thread_id, current_thread_id):
+                return True
+            self._add_edge(current_thread_id, target_thread_id)
+            return False
+
+    def _acquire(self, account: int, thread_id: int, timeout: float) -> bool:
+        """Acquire an account lock and record its owner."""
+        if not self.locks[account].acquire(timeout=timeout):
+            return False
+        self.lock_owner[account] = thread_id
+        return True
+
+    def _release(self, account: int) -> None:
+        """Clear an account lock's owner and release it."""
+        self.lock_owner.pop(account, None)
+        self.locks[account].release()
 
     def transfer(self, from_account: int, to_account: int, amount: int) -> bool:
         """Transfer money between accounts with deadlock detection."""
@@ -57,23 +96,24 @@ class Bank:
         current_thread_id = threading.get_ident()
         
         # Try to acquire from_account lock
-        if not self.locks[from_account].acquire(timeout=1.0):
+        if not self._acquire(from_account, current_thread_id, timeout=1.0):
             return False
         
         try:
-            # Check if to_account lock is held by another thread
-            if self.locks[to_account].locked():
-                # Assume the lock is held by another thread (simplified)
-                # In a real system, we'd need to know which thread holds it
-                for other_thread_id in self.wait_graph:
-                    if other_thread_id != current_thread_id:
-                        if self._check_deadlock(current_thread_id, other_thread_id):
-                            raise DeadlockDetectedException(
-                                f"Deadlock detected: Thread {current_thread_id} waiting for {to_account}"
-                            )
-            
-            # Try to acquire to_account lock
-            if not self.locks[to_account].acquire(timeout=1.0):
+            # Optimistic wait: only pay for deadlock detection if to_account is not granted quickly
+            acquired = self._acquire(to_account, current_thread_id, timeout=DEADLOCK_TIMEOUT)
+            if not acquired:
+                # Probe only the thread that actually holds to_account
+                owner = self.lock_owner.get(to_account)
+                if owner is not None and owner != current_thread_id:
+                    if self._check_deadlock(current_thread_id, owner):
+                        self._clear_waits(current_thread_id)
+                        raise DeadlockDetectedException(
+                            f"Deadlock detected: Thread {current_thread_id} waiting for {to_account}"
+                        )
+                acquired = self._acquire(to_account, current_thread_id, timeout=1.0 - DEADLOCK_TIMEOUT)
+                self._clear_waits(current_thread_id)
+            if not acquired:
                 return False
             
             try:
@@ -82,10 +122,10 @@ class Bank:
                 self.accounts[to_account] += amount
                 return True
             finally:
-                self.locks[to_account].release()
+                self._release(to_account)
         finally:
-            self.locks[from_account].release()
-    
+            self._release(from_account)
+
     def get_balance(self, account: int) -> int:
         """Return the balance of an account."""
         with self.locks[account]:
@@ -1,7 +1,9 @@
 import threading
 import time
-from typing import Dict, List
-import numpy as np
+from typing import Deque, Dict, List, Optional
+from collections import deque
+
+DEADLOCK_TIMEOUT = 0.1  # Seconds to wait on a lock before running deadlock detection
 
 class DeadlockDetectedException(Exception):
     pass
@@ -11,62 +13,123 @@ class Bank:
         """Initialize accounts, locks, and deadlock detection matrix."""
         self.accounts: Dict[int, int] = accounts  # Account ID -> Balance
         self.locks: Dict[int, threading.Lock] = {acc: threading.Lock() for acc in accounts}
-        self.max_threads = max_threads  # Maximum number of threads for matrix size
+        self.max_threads = max_threads  # Current matrix size; grows on demand since rows are unbounded ints
         self.thread_ids = {}  # Map thread_id to matrix index
-        self.next_index = 0  # Next available matrix index
+        self.index_threads: List[Optional[int]] = [None] * max_threads  # Matrix index -> thread_id
+        self._free_indices: Deque[int] = deque(range(max_threads))  # Recycled matrix indices
         self.matrix_lock = threading.Lock()  # Protects thread_ids and matrix
-        self.wait_matrix = np.zeros((max_threads, max_threads), dtype=int)  # Adjacency matrix for wait-for graph
+        # Account ID -> thread ID holding its lock; single dict ops are atomic under the GIL
+        self.lock_owner: Dict[int, int] = {}
+        # Adjacency matrix for wait-for graph, one int bitmask per row: bit j of row i means i -> j
+        self.wait_matrix: List[int] = [0] * max_threads
+        self._waiters: List[int] = [0] * max_threads  # Column bitmasks: bit i of entry j means i -> j
+        self._dfs_stack: List[int] = []  # Reusable DFS stack, only touched under matrix_lock
 
     def _get_thread_index(self, thread_id: int) -> int:
-        """Assign a matrix index to a thread ID."""
-        with self.matrix_lock:
-            if thread_id not in self.thread_ids:
-                if self.next_index >= self.max_threads:
-                    raise ValueError("Too many threads for matrix size")
-                self.thread_ids[thread_id] = self.next_index
-                self.next_index += 1
-            return self.thread_ids[thread_id]
-
-    def _detect_cycle(self) -> bool:
-        """Detect cycles in the wait-for matrix using transitive closure."""
-        n = self.next_index
-        if n == 0:
-            return False
-        
-        # Compute transitive closure using Warshall's algorithm
-        closure = self.wait_matrix[:n, :n].copy()
-        for k in range(n):
-            for i in range(n):
-                for j in range(n):
-                    closure[i][j] |= (closure[i][k] and closure[k][j])
-        
-        # Check for cycles (diagonal elements indicate a thread can reach itself)
-        for i in range(n):
-            if closure[i][i]:
+        """Assign a matrix index to a thread ID (caller holds matrix_lock)."""
+        idx = self.thread_ids.get(thread_id)
+        if idx is None:
+            if not self._free_indices:
+                self._grow()
+            idx = self._free_indices.popleft()
+            self.thread_ids[thread_id] = idx
+            self.index_threads[idx] = thread_id
+        return idx
+
+    def _grow(self) -> None:
+        """Double the matrix size (caller holds matrix_lock)."""
+        old_size = self.max_threads
+        extra = max(old_size, 1)
+        self.max_threads = old_size + extra
+        self.index_threads.extend([None] * extra)
+        self.wait_matrix.extend([0] * extra)
+        self._waiters.extend([0] * extra)
+        self._free_indices.extend(range(old_size, self.max_threads))
+
+    def _reachable(self, src_idx: int, dst_idx: int) -> bool:
+        """Stack-based DFS over the bitmask rows: is dst reachable from src?"""
+        if src_idx == dst_idx:
+            return True
+        wait_matrix = self.wait_matrix
+        goal = 1 << dst_idx
+        visited = 1 << src_idx  # Bitmask, so nothing to reset between calls
+        stack = self._dfs_stack
+        stack.clear()
+        stack.append(src_idx)
+        while stack:
+            row = wait_matrix[stack.pop()]
+            if row & goal:
                 return True
+            row &= ~visited
+            visited |= row
+            while row:
+                bit = row & -row
+                stack.append(bit.bit_length() - 1)
+                row ^= bit
         return False
 
+    def _set_edge(self, i: int, j: int) -> None:
+        """Record i -> j in both the row and column masks (caller holds matrix_lock)."""
+        self.wait_matrix[i] |= 1 << j
+        self._waiters[j] |= 1 << i
+
+    def _release_if_idle(self, idx: int) -> None:
+        """Recycle a matrix index once it has no edges in or out (caller holds matrix_lock)."""
+        if not self.wait_matrix[idx] and not self._waiters[idx]:
+            del self.thread_ids[self.index_threads[idx]]
+            self.index_threads[idx] = None
+            self._free_indices.appendleft(idx)
+
+    def _clear_waits(self, thread_id: int) -> None:
+        """Remove every outgoing wait-for edge of thread_id."""
+        # Only thread_id registers itself as a waiter, so an unlocked miss is safe
+        if thread_id not in self.thread_ids:
+            return
+        with self.matrix_lock:
+            idx = self.thread_ids.get(thread_id)
+            if idx is None:
+                return
+            row = self.wait_matrix[idx]
+            self.wait_matrix[idx] = 0
+            clear_mask = ~(1 << idx)
+            while row:
+                bit = row & -row
+                target_idx = bit.bit_length() - 1
+                self._waiters[target_idx] &= clear_mask
+                self._release_if_idle(target_idx)
+                row ^= bit
+            self._release_if_idle(idx)
+
     def _check_deadlock(self, current_thread_id: int, target_thread_id: int) -> bool:
-        """Check if adding a wait-for edge causes a deadlock."""
+        """Check if adding a wait-for edge causes a deadlock.
+
+        Edge current -> target closes a cycle iff target already reaches current;
+        otherwise the edge is recorded for as long as current waits.
+        """
         with self.matrix_lock:
             current_idx = self._get_thread_index(current_thread_id)
             target_idx = self._get_thread_index(target_thread_id)
-            
-            # Add edge to wait-for matrix
-            self.wait_matrix[current_idx][target_idx] = 1
-            
-            # Check for cycle
-            cycle_exists = self._detect_cycle()
-            
-            # Remove edge after checking
-            self.wait_matrix[current_idx][target_idx] = 0
-            
-            # Clean up if no outgoing edges
-            if not any(self.wait_matrix[current_idx]):
-                del self.thread_ids[current_thread_id]
-                self.next_index = max(self.thread_ids.values(), default=-1) + 1
-            
-            return cycle_exists
+
+            if self._reachable(target_idx, current_idx):
+                # Clean up indices that carry no edges
+                self._release_if_idle(current_idx)
+                if target_idx != current_idx:
+                    self._release_if_idle(target_idx)
+                return True
+            self._set_edge(current_idx, target_idx)
+            return False
+
+    def _acquire(self, account: int, thread_id: int, timeout: float) -> bool:
+        """Acquire an account lock and record its owner."""
+        if not self.locks[account].acquire(timeout=timeout):
+            return False
+        self.lock_owner[account] = thread_id
+        return True
+
+    def _release(self, account: int) -> None:
+        """Clear an account lock's owner and release it."""
+        self.lock_owner.pop(account, None)
+        self.locks[account].release()
 
     def transfer(self, from_account: int, to_account: int, amount: int) -> bool:
         """Transfer money between accounts with matrix-based deadlock detection."""
@@ -78,22 +141,24 @@ class Bank:
         current_thread_id = threading.get_ident()
         
         # Try to acquire from_account lock
-        if not self.locks[from_account].acquire(timeout=1.0):
+        if not self._acquire(from_account, current_thread_id, timeout=1.0):
             return False
         
         try:
-            # Check if to_account lock is held by another thread
-            if self.locks[to_account].locked():
-                # Check for deadlock with other threads
-                for other_thread_id in self.thread_ids:
-                    if other_thread_id != current_thread_id:
-                        if self._check_deadlock(current_thread_id, other_thread_id):
-                            raise DeadlockDetectedException(
-                                f"Deadlock detected: Thread {current_thread_id} waiting for {to_account}"
-                            )
-            
-            # Try to acquire to_account lock
-            if not self.locks[to_account].acquire(timeout=1.0):
+            # Optimistic wait: only pay for deadlock detection if to_account is not granted quickly
+            acquired = self._acquire(to_account, current_thread_id, timeout=DEADLOCK_TIMEOUT)
+            if not acquired:
+                # Probe only the thread that actually holds to_account
+                owner = self.lock_owner.get(to_account)
+                if owner is not None and owner != current_thread_id:
+                    if self._check_deadlock(current_thread_id, owner):
+                        self._clear_waits(current_thread_id)
+                        raise DeadlockDetectedException(
+                            f"Deadlock detected: Thread {current_thread_id} waiting for {to_account}"
+                        )
+                acquired = self._acquire(to_account, current_thread_id, timeout=1.0 - DEADLOCK_TIMEOUT)
+                self._clear_waits(current_thread_id)
+            if not acquired:
                 return False
             
             try:
@@ -102,9 +167,9 @@ class Bank:
                 self.accounts[to_account] += amount
                 return True
             finally:
-                self.locks[to_account].release()
+                self._release(to_account)
         finally:
-            self.locks[from_account].release()
+            self._release(from_account)
 
     def get_balance(self, account: int) -> int:
         """Return the balance of an account."""
@@ -1,42 +1,27 @@
-
 import threading
-import bisect
-from sortedcontainers import SortedDict
+from operator import itemgetter
+from sortedcontainers import SortedKeyList
 
 class TimeSeriesStore:
     def __init__(self):
-        self.points = []  # List of (timestamp, value) tuples
-        self.buffer = SortedDict()  # Buffer for out-of-order inserts
+        # (timestamp, value) tuples kept ordered by timestamp; out-of-order inserts are O(log N)
+        self.points = SortedKeyList(key=itemgetter(0))
         self.lock = threading.Lock()
 
     def insert(self, timestamp, value):
         with self.lock:
-            if not self.points or timestamp >= self.points[-1][0]:
-                self.points.append((timestamp, value))
-            else:
-                self.buffer[timestamp] = value
-                if len(self.buffer) > 100:
-                    self._merge_buffer()
-    def _merge_buffer(self):
-        for ts, value in self.buffer.items():
-            index = bisect.bisect_left([p[0] for p in self.points], ts)
-            self.points.insert(index, (ts, value))
-        self.buffer.clear()
+            self.points.add((timestamp, value))
 
     def get_latest_before_or_equal(self, timestamp):
         with self.lock:
-            self._merge_buffer()
-            if not self.points:
-                return None
-            index = bisect.bisect_right([p[0] for p in self.points], timestamp) - 1
+            index = self.points.bisect_key_right(timestamp) - 1
             if index < 0:
                 return None
             return self.points[index]
 
     def expire_before(self, cutoff):
         with self.lock:
-            index = bisect.bisect_left([p[0] for p in self.points], cutoff)
-            self.points = self.points[index:]
+            del self.points[:self.points.bisect_key_left(cutoff)]
 
     def size(self):
         with self.lock:
@@ -1,14 +1,23 @@
 import threading
 import bisect
-from typing import Optional, Tuple
+import heapq
+from array import array
+from operator import itemgetter
+from typing import List, Optional
 from collections import namedtuple
 
+# Return wrapper only; storage is kept as parallel primitive columns
 Point = namedtuple('Point', ['timestamp', 'value'])
 
 class TimeSeriesStore:
     def __init__(self):
-        self._active = []  # Writer's buffer
-        self._frozen = []  # Reader's snapshot
+        # Writer's buffer
+        self._active_ts: List[int] = []
+        self._active_vals: List[float] = []
+        # Reader's snapshot: tuple of sorted (timestamps, values) typed-array segments,
+        # oldest first. Segments are never mutated once published, and the tuple is
+        # swapped with one attribute store, so a single load gives readers a consistent view
+        self._frozen = ()
         self._lock = threading.Lock()
         self._last_timestamp = -float('inf')
 
@@ -16,56 +25,95 @@ class TimeSeriesStore:
         """Insert a (timestamp, value) pair, optimized for mostly monotonic timestamps."""
         with self._lock:
             if timestamp >= self._last_timestamp:
-                self._active.append(Point(timestamp, value))
+                self._active_ts.append(timestamp)
+                self._active_vals.append(value)
                 self._last_timestamp = timestamp
             else:
-                # Out-of-order: insert into active list at correct position
-                bisect.insort(self._active, Point(timestamp, value))
+                # Out-of-order: insert into active columns at correct position
+                idx = bisect.bisect_right(self._active_ts, timestamp)
+                self._active_ts.insert(idx, timestamp)
+                self._active_vals.insert(idx, value)
             # Periodically swap buffers to update readers
-            if len(self._active) > 1000:  # Arbitrary threshold for swapping
-                self._frozen = self._active
-                self._active = self._frozen[:]
-                self._active.clear()
+            if len(self._active_ts) > 1000:  # Arbitrary threshold for swapping
+                self._rotate()
+
+    @staticmethod
+    def _merge_segments(older, newer):
+        """Merge two sorted segments; points of older come first on equal timestamps."""
+        old_ts, old_vals = older
+        new_ts, new_vals = newer
+        # Older points up to newer's first timestamp are untouched: copy them as a
+        # slice (one memcpy) and merge only the overlapping tail in Python
+        cut = bisect.bisect_right(old_ts, new_ts[0])
+        merged_ts, merged_vals = old_ts[:cut], old_vals[:cut]
+        if cut == len(old_ts):
+            return merged_ts + new_ts, merged_vals + new_vals
+        tail = zip(old_ts[cut:], old_vals[cut:])
+        for ts, val in heapq.merge(tail, zip(new_ts, new_vals), key=itemgetter(0)):
+            merged_ts.append(ts)
+            merged_vals.append(val)
+        return merged_ts, merged_vals
+
+    def _rotate(self) -> None:
+        """Publish the active buffer as a new frozen segment (caller holds _lock)."""
+        segments = list(self._frozen)
+        segment = (array('q', self._active_ts), array('d', self._active_vals))
+        # Binary-counter compaction: fold into the previous segment while it is no
+        # bigger, so each point is copied O(log n) times and there are O(log n) segments
+        while segments and len(segments[-1][0]) <= len(segment[0]):
+            segment = self._merge_segments(segments.pop(), segment)
+        segments.append(segment)
+        # Built off to the side; readers keep walking the old tuple meanwhile
+        self._frozen = tuple(segments)  # Single reference store, atomic under the GIL
+        self._active_ts = []
+        self._active_vals = []
+        self._last_timestamp = -float('inf')
 
     def get_latest_before_or_equal(self, timestamp: int) -> Optional[Point]:
         """Get the latest point before or equal to the given timestamp."""
-        # Read from frozen snapshot, no lock needed
-        if not self._frozen:
-            return None
-        idx = bisect.bisect_right([p.timestamp for p in self._frozen], timestamp)
-        if idx == 0:
-            return None
-        return self._frozen[idx - 1]
+        # Read from frozen snapshot, no lock needed: one load, never mutated after publish
+        latest = None
+        for frozen_ts, frozen_vals in self._frozen:
+            idx = bisect.bisect_right(frozen_ts, timestamp)
+            # Later segments hold later inserts, so they win ties
+            if idx and (latest is None or frozen_ts[idx - 1] >= latest.timestamp):
+                latest = Point(frozen_ts[idx - 1], frozen_vals[idx - 1])
+        return latest
 
     def get_range(self, start: int, end: int) -> List[Point]:
         """Get all points with timestamps in [start, end] (inclusive), including active buffer up to end."""
         with self._lock:
-            if not self._frozen and not self._active:
-                return []
-            # Get points from frozen in [start, end]
-            frozen_timestamps = [p.timestamp for p in self._frozen]
-            frozen_start_idx = bisect.bisect_left(frozen_timestamps, start)
-            frozen_end_idx = bisect.bisect_right(frozen_timestamps, end)
-            result = self._frozen[frozen_start_idx:frozen_end_idx]
-            # Get points from active up to end
-            active_timestamps = [p.timestamp for p in self._active]
-            active_start_idx = bisect.bisect_left(active_timestamps, start)
-            active_end_idx = bisect.bisect_right(active_timestamps, end)
-            result.extend(self._active[active_start_idx:active_end_idx])
-            # Sort to ensure order (in case active points overlap with frozen)
-            return sorted(result, key=lambda p: p.timestamp)
+            columns = list(self._frozen)
+            columns.append((self._active_ts, self._active_vals))
+            # Every column is already sorted: slice each and k-way merge, no re-sort
+            slices = []
+            for ts, vals in columns:
+                lo = bisect.bisect_left(ts, start)
+                hi = bisect.bisect_right(ts, end, lo)
+                if lo < hi:
+                    slices.append(map(Point, ts[lo:hi], vals[lo:hi]))
+            if len(slices) == 1:
+                return list(slices[0])
+            return list(heapq.merge(*slices, key=itemgetter(0)))
 
     def expire_before(self, cutoff: int) -> None:
         """Remove all points with timestamp < cutoff."""
         with self._lock:
             # Update both active and frozen buffers
-            self._active = [p for p in self._active if p.timestamp >= cutoff]
-            self._frozen = [p for p in self._frozen if p.timestamp >= cutoff]
-            self._last_timestamp = min((p.timestamp for p in self._active), default=-float('inf'))
+            idx = bisect.bisect_left(self._active_ts, cutoff)
+            del self._active_ts[:idx]
+            del self._active_vals[:idx]
+            segments = []
+            for frozen_ts, frozen_vals in self._frozen:
+                idx = bisect.bisect_left(frozen_ts, cutoff)
+                if idx < len(frozen_ts):
+                    segments.append((frozen_ts[idx:], frozen_vals[idx:]) if idx else (frozen_ts, frozen_vals))
+            self._frozen = tuple(segments)
+            self._last_timestamp = self._active_ts[-1] if self._active_ts else -float('inf')
 
     def size(self) -> int:
         """Return the number of points in the frozen buffer."""
-        return len(self._frozen)
+        return sum(len(frozen_ts) for frozen_ts, _ in self._frozen)
 
 # Example usage and test
 if __name__ == "__main__":
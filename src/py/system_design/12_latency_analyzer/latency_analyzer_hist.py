@@ -1,45 +1,117 @@
 import threading
 import math
+import numpy as np
 
 class LatencyAnalyzer:
     def __init__(self, bucket_size_ms=1, max_latency_ms=1000):
         self.bucket_width = bucket_size_ms
         self.num_buckets = math.ceil(max_latency_ms / bucket_size_ms)
-        self.buckets = [0] * self.num_buckets
-        self.total_samples = 0
-        self.lock = threading.Lock()
+        # Precomputed for the hot path: compare instead of min(). Bucketing stays a
+        # floor-divide; a reciprocal multiply misplaces exact boundaries (49 / 49 -> 0.999...)
+        self._max_bucket = self.num_buckets - 1
+        # One bucket array per producer thread; writers never share a counter
+        self._shards = []
+        self._local = threading.local()
+        # reset() swaps in fresh shards by bumping the generation; writers notice on their next record
+        self._generation = 0
+        self._owners = {}  # Thread -> its newest shard, to know when a retired shard is done
+        self._retired = []  # [shard, counts already reported, owner] still open to in-flight writes
+        self.lock = threading.Lock()  # Guards shard registration and aggregation, not the write path
 
-    def record(self, latency_ms):
+    def _get_shard(self):
+        local = self._local
+        if getattr(local, 'generation', -1) != self._generation:
+            shard = np.zeros(self.num_buckets, dtype=np.int64)
+            with self.lock:
+                self._shards.append(shard)
+                self._owners[threading.current_thread()] = shard
+                local.generation = self._generation
+            local.buckets = shard
+        return local.buckets
+
+    def _aggregate(self):
+        # Caller holds self.lock
+        if not self._shards:
+            return np.zeros(self.num_buckets, dtype=np.int64)
+        return np.sum(np.stack(self._shards), axis=0)
+
+    @property
+    def total_samples(self):
         with self.lock:
-            bucket = min(int(latency_ms // self.bucket_width), self.num_buckets - 1)
-            self.buckets[bucket] += 1
-            self.total_samples += 1
+            return int(self._aggregate().sum())
+
+    def record(self, latency_ms):
+        # Lock-free: only the calling thread writes to its shard
+        bucket = int(latency_ms // self.bucket_width)
+        if bucket > self._max_bucket:
+            bucket = self._max_bucket
+        elif bucket < 0:
+            bucket = 0
+        self._get_shard()[bucket] += 1
+
+    def record_many(self, latencies_ms):
+        """Record a batch of samples into the calling thread's shard."""
+        latencies_ms = np.asarray(latencies_ms, dtype=np.float64)
+        if latencies_ms.size == 0:
+            return
+        # Same clamping as record(): negatives land in bucket 0, overflow in the last one
+        idx = np.clip(np.floor_divide(latencies_ms, self.bucket_width).astype(np.int64), 0, self._max_bucket)
+        shard = self._get_shard()
+        shard += np.bincount(idx, minlength=self.num_buckets)
 
     def get_percentile(self, percentile):
         if not 0 <= percentile <= 100:
             raise ValueError("Percentile must be between 0 and 100")
         with self.lock:
-            if self.total_samples == 0:
-                return None
-            target = self.total_samples * (percentile / 100)
-            print(f" aiming for values till we hit the count of samples:{target} vs total:{self.total_samples}")
-            count = 0
-            for i, bucket_count in enumerate(self.buckets):
-                count += bucket_count
-                if count >= target:
-                    # Linear interpolation within bucket
-                    lower_bound = i * self.bucket_width
-                    if count == bucket_count:
-                        return lower_bound
-                    fraction = (target - (count - bucket_count)) / bucket_count
-                    return lower_bound + fraction * self.bucket_width
+            buckets = self._aggregate()
+        cumulative = np.cumsum(buckets)
+        total_samples = int(cumulative[-1])
+        if total_samples == 0:
+            return None
+        target = total_samples * (percentile / 100)
+        print(f" aiming for values till we hit the count of samples:{target} vs total:{total_samples}")
+        # First bucket whose running count reaches the target
+        i = int(np.searchsorted(cumulative, target, side='left'))
+        if i >= self.num_buckets:
             return self.num_buckets * self.bucket_width
+        count = int(cumulative[i])
+        bucket_count = int(buckets[i])
+        # Linear interpolation within bucket
+        lower_bound = i * self.bucket_width
+        if count == bucket_count:
+            return lower_bound
+        fraction = (target - (count - bucket_count)) / bucket_count
+        return lower_bound + fraction * self.bucket_width
 
     def reset(self):
+        """Return the counts since the last reset and start a new window.
+
+        Shards are never written by reset, so it cannot race the unlocked writers:
+        they move to fresh shards of the new generation on their next call. A
+        retired shard stays open, with late increments reported by later resets,
+        until its owner has moved on or exited and so can no longer write to it.
+        """
         with self.lock:
-            snapshot = self.buckets.copy()
-            self.buckets = [0] * self.num_buckets
-            self.total_samples = 0
+            self._generation += 1
+            owners = self._owners
+            for owner in [owner for owner in owners if not owner.is_alive()]:
+                del owners[owner]
+            owner_of = {id(shard): owner for owner, shard in owners.items()}
+            snapshot = np.zeros(self.num_buckets, dtype=np.int64)
+            still_open = []
+            for entry in self._retired:
+                shard, reported, owner = entry
+                counts = shard.copy()
+                snapshot += counts - reported
+                if owners.get(owner) is shard:
+                    entry[1] = counts
+                    still_open.append(entry)
+            for shard in self._shards:
+                counts = shard.copy()
+                snapshot += counts
+                still_open.append([shard, counts, owner_of.get(id(shard))])
+            self._shards = []
+            self._retired = still_open
         return snapshot
 
 # Example usage
@@ -49,11 +121,16 @@ if __name__ == "__main__":
     import random
     import time
 
-    def worker(analyzer, num_samples):
+    def worker(analyzer, num_samples, batch_size=100):
+        # Accumulate locally and flush in batches to amortize per-call overhead
+        batch = []
         for _ in range(num_samples):
-            latency = random.uniform(0, 101)
-            analyzer.record(latency)
+            batch.append(random.uniform(0, 101))
+            if len(batch) >= batch_size:
+                analyzer.record_many(batch)
+                batch.clear()
             time.sleep(0.001)
+        analyzer.record_many(batch)
 
     threads = [threading.Thread(target=worker, args=(analyzer, 1000)) for _ in range(5)]
     for t in threads:
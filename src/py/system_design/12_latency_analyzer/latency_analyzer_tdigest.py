@@ -1,5 +1,6 @@
 from tdigest import TDigest
 from collections import deque
+from typing import Optional
 import time
 import random
 
@@ -13,6 +14,9 @@ class SlidingWindowTDigest:
         self.buffer = deque(maxlen=self.num_slots)
         self.current_digest = TDigest()
         self.last_flush_time = int(time.time())
+        # Merged view of the window, rebuilt only after add() or a slot rotation
+        self._merged_cache: Optional[TDigest] = None
+        self._cache_dirty = True
 
     def _flush(self):
         now = int(time.time())
@@ -23,27 +27,43 @@ class SlidingWindowTDigest:
             self.buffer.append((self.last_flush_time, self.current_digest))
             self.current_digest = TDigest()
             self.last_flush_time += 1
+            self._cache_dirty = True
 
     def add(self, latency_us):
         self._flush()
         self.current_digest.update(latency_us)
+        self._cache_dirty = True
 
-    def percentile(self, p):
+    def _merged(self):
         self._flush()
-        # Merge digests in the current window
-        merged = TDigest()
-        for _, d in self.buffer:
-            merged = TDigest.merge(merged, d)
-        merged = TDigest.merge(merged, self.current_digest)
+        if self._cache_dirty or self._merged_cache is None:
+            # Merge digests in the current window pairwise (TDigest + returns a new merged digest)
+            ds = [d for _, d in self.buffer]
+            ds.append(self.current_digest)
+            while len(ds) > 1:
+                paired = [ds[i] + ds[i + 1] for i in range(0, len(ds) - 1, 2)]
+                if len(ds) % 2:
+                    paired.append(ds[-1])
+                ds = paired
+            self._merged_cache = ds[0]
+            self._cache_dirty = False
+        return self._merged_cache
+
+    def percentile(self, p):
+        merged = self._merged()
         if merged.n == 0:
             return 0.0
         return merged.percentile(p)
 
     def stats(self):
+        # Single rebuild shared by all three percentiles
+        merged = self._merged()
+        if merged.n == 0:
+            return {"p50": 0.0, "p90": 0.0, "p99": 0.0}
         return {
-            "p50": self.percentile(50),
-            "p90": self.percentile(90),
-            "p99": self.percentile(99)
+            "p50": merged.percentile(50),
+            "p90": merged.percentile(90),
+            "p99": merged.percentile(99)
         }
 
 if __name__ == "__main__":
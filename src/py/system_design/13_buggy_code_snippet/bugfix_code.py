@@ -1,56 +1,51 @@
 import threading
-from collections import deque
+import queue
 import time
 import sys
 import random
 
+_SENTINEL = object()  # Queued by stop() to wake and end the consumer
+
 class ThreadSafeEventProcessor:
     def __init__(self, event_handler):
-        self.event_queue = deque()
+        self.event_queue = queue.SimpleQueue()  # C-level MPMC queue, no Python lock/condition round trip
         self.event_handler = event_handler
-        self.stop_flag = False
-        self.lock = threading.Lock()
-        self.condition = threading.Condition(self.lock)
+        self._stopped = threading.Event()
+        self._submit_lock = threading.Lock()  # Makes stop check + put atomic against stop()
         self.consumer_thread = None
 
     def start(self):
-        with self.lock:
-            self.stop_flag = False
+        self._stopped.clear()
         self.consumer_thread = threading.Thread(target=self._run)
         self.consumer_thread.start()
 
     def stop(self):
-        with self.lock:
-            print(f"Processing Stopping")
-            self.stop_flag = True
-            self.condition.notify_all()  # Wake consumer to check stop
-        self.event_queue.append(None)  # Signal to exit
+        print(f"Processing Stopping")
+        with self._submit_lock:
+            self._stopped.set()
+            self.event_queue.put(_SENTINEL)  # Signal to exit; nothing can be queued after it
         if self.consumer_thread:
             self.consumer_thread.join()
 
     def submit(self, event):
-        with self.condition:
-            if self.stop_flag:
+        with self._submit_lock:
+            if self._stopped.is_set():
                 raise RuntimeError(f"Cannot submit event:{event} PROCESSOR STOPPED")
-            self.event_queue.append(event)
-            print(f"={self.stop_flag}, ", end="")
-            self.condition.notify()  # Notify consumer of new event
+            self.event_queue.put(event)
+        print(f"={self._stopped.is_set()}, ", end="")
+
+    def _handle(self, event):
+        try:
+            self.event_handler(event)
+        except Exception as e:
+            print(f"Exception in event handler: {e}")
 
     def _run(self):
         while True:
-            with self.condition:
-                while not self.stop_flag and len(self.event_queue) == 0:
-                    self.condition.wait()  # Wait for events or stop
-                if self.stop_flag and len(self.event_queue) == 0:
-                    break
-                event = self.event_queue.popleft()
-                if event is None and self.stop_flag:
-                    break
-            try:
-                if event is not None:
-                    self.event_handler(event)
-            except Exception as e:
-                print(f"Exception in event handler: {e}")
+            event = self.event_queue.get()  # Blocks until an event or the sentinel arrives
+            if event is _SENTINEL:
+                break
+            self._handle(event)
         print(f" __ EOP __ ")
 
 # Example usage
@@ -1,11 +1,11 @@
 import threading
-from collections import deque
+import queue
 import time
 import random
 
 class BuggyEventProcessor:
     def __init__(self, event_handler):
-        self.event_queue = deque()
+        self.event_queue = queue.SimpleQueue()
         self.event_handler = event_handler
         self.stop_flag = False
         self.consumer_thread = None
@@ -17,7 +17,7 @@ class BuggyEventProcessor:
 
     def stop(self):
         self.stop_flag = True
-        self.event_queue.append(None)  # Signal to exit
+        self.event_queue.put(None)  # Signal to exit
         print(f"\nProcessing Stopping\n")
         if self.consumer_thread:
             self.consumer_thread.join()
@@ -25,19 +25,16 @@ class BuggyEventProcessor:
     def submit(self, event):
         if self.stop_flag:
             raise RuntimeError(f"Cannot submit event:{event} PROCESSOR STOPPED")
-        self.event_queue.append(event)
+        self.event_queue.put(event)
         print(f"={self.stop_flag}, ", end="")
 
     def _run(self):
         while True:
-            if not self.event_queue:
-                continue
-            event = self.event_queue.popleft()
-            if event is None and self.stop_flag:
+            event = self.event_queue.get()  # Blocks until an event or the stop sentinel arrives
+            if event is None:
                 break
             try:
-                if event is not None:
-                    self.event_handler(event)
+                self.event_handler(event)
             except Exception as e:
                 print(f"Exception in event handler: {e}")
         print(f" __ EOP __ ")
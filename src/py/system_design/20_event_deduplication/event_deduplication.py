@@ -1,49 +1,470 @@
 import threading
-import hashlib
+import math
+import os
+import struct
+import sys
+import xxhash
 import time
-from collections import deque
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+
+try:
+    # Optional compiled hot path: cythonize -i _event_dedup.pyx
+    from _event_dedup import FastEventDeduplicator, xxh3_64_batch as _hash64_batch
+except ImportError:
+    FastEventDeduplicator = None
+    _hash64_batch = None
+
+_hash64 = xxhash.xxh3_64_intdigest
+
+_pack_fields = struct.Struct('<dq').pack
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+def _pack_signature(symbol, price, timestamp):
+    # Full symbol bytes then a fixed 16-byte (price, timestamp) tail, so distinct events never share a buffer
+    try:
+        return symbol.encode() + _pack_fields(price, timestamp)
+    except (struct.error, AttributeError):
+        # Fields struct can't pack (None price, float timestamp, non-str symbol): hash the text form
+        return f"{symbol}:{price}:{timestamp}".encode()
+
+@dataclass(slots=True, frozen=True)
+class Event:
+    symbol: str
+    price: float
+    timestamp: int
+
+    @classmethod
+    def from_dict(cls, event):
+        # Ingest path: few distinct tickers, so interning makes symbol compares identity checks
+        return cls(sys.intern(event.get('symbol', '')), event.get('price', 0.0), event.get('timestamp', 0))
 
 class EventDeduplicator:
     def __init__(self, window_seconds=60):
-        self.window_seconds = window_seconds
-        self.signatures = deque()  # (timestamp, signature) pairs
-        self.signature_set = set()  # For O(1) lookup
+        self.window_ns = int(window_seconds * 1_000_000_000)
+        # Signature -> first-seen monotonic ns, in insertion (= time) order: one
+        # structure serves both the O(1) lookup and oldest-first expiry
+        self.signatures = OrderedDict()
         self.lock = threading.Lock()
 
-    def _generate_signature(self, event):
+    @staticmethod
+    def _fields_signature(symbol, price, timestamp):
         # Hash relevant event fields (e.g., symbol, price, timestamp)
-        event_str = f"{event.get('symbol', '')}:{event.get('price', '')}:{event.get('timestamp', '')}"
-        return hashlib.sha256(event_str.encode()).hexdigest()
+        # No adversary here, so a fast 64-bit non-cryptographic hash is enough
+        return _hash64(_pack_signature(symbol, price, timestamp))
+
+    @staticmethod
+    def _generate_signature(event):
+        return _hash64(_pack_signature(event.symbol, event.price, event.timestamp))
 
-    def is_duplicate(self, event):
+    @staticmethod
+    def _generate_signatures(events):
+        # Same digests as _generate_signature; the compiled batch hashes them all without the GIL
+        if _hash64_batch is None:
+            return [_hash64(_pack_signature(event.symbol, event.price, event.timestamp)) for event in events]
+        return _hash64_batch([_pack_signature(event.symbol, event.price, event.timestamp) for event in events])
+
+    def _expire(self, now_ns):
+        # Remove expired signatures from the old end (caller holds self.lock)
+        signatures = self.signatures
+        cutoff = now_ns - self.window_ns
+        while signatures:
+            _, first_seen = next(iter(signatures.items()))
+            if first_seen >= cutoff:
+                break
+            signatures.popitem(last=False)
+
+    def _check(self, signature, now_ns):
+        # Check for duplicate, recording the signature if new (caller holds self.lock)
+        if signature in self.signatures:
+            return True
+        self.signatures[signature] = now_ns
+        return False
+
+    def _check_signature(self, signature, now_ns):
         with self.lock:
-            current_time = time.time()
-            signature = self._generate_signature(event)
-            
-            # Remove expired signatures
-            while self.signatures and current_time - self.signatures[0][0] > self.window_seconds:
-                _, old_signature = self.signatures.popleft()
-                self.signature_set.discard(old_signature)
-            
-            # Check for duplicate
+            self._expire(now_ns)
+            return self._check(signature, now_ns)
+
+    def is_duplicate(self, event, now_ns=None):
+        """now_ns (time.monotonic_ns()) lets callers share one clock reading across calls."""
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return self._check_signature(self._generate_signature(event), now_ns)
+
+    def is_duplicate_fields(self, symbol, price, timestamp, now_ns=None):
+        """Fast path for callers that already hold the fields: no Event or dict is built.
+
+        Prefer is_duplicate_fields(sym, px, ts) over is_duplicate_dict({...}) at call sites
+        that unpack a feed message anyway.
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return self._check_signature(self._fields_signature(symbol, price, timestamp), now_ns)
+
+    def is_duplicate_dict(self, event, now_ns=None):
+        """Back-compat wrapper for callers still passing {'symbol', 'price', 'timestamp'} dicts."""
+        return self.is_duplicate_fields(event.get('symbol', ''), event.get('price', 0.0), event.get('timestamp', 0), now_ns)
+
+    def is_duplicate_batch(self, events, now_ns=None):
+        """Check a burst of events: hash outside the lock, then one lock, clock read and expiry pass."""
+        signatures = self._generate_signatures(events)
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        with self.lock:
+            self._expire(now_ns)
+            check = self._check
+            return [check(signature, now_ns) for signature in signatures]
+
+class ArrayEventDeduplicator:
+    """Exact deduplicator keeping (timestamp, signature) pairs in a preallocated numpy buffer.
+
+    Entries are 16 contiguous bytes instead of a boxed tuple each, and expiry is a
+    single searchsorted over the timestamp column. Live entries occupy
+    entries[head:tail]; the buffer is compacted (or doubled) when tail hits the end.
+    """
+    def __init__(self, window_seconds=60, capacity=1 << 16):
+        self.window_ns = int(window_seconds * 1_000_000_000)
+        self.entries = np.empty(capacity, dtype=[('ts', 'i8'), ('sig', 'u8')])
+        self.head = 0
+        self.tail = 0
+        self.signature_set = set()  # For O(1) lookup
+        self.lock = threading.Lock()
+
+    def _expire(self, now_ns):
+        # Drop entries older than the window (caller holds self.lock)
+        live_ts = self.entries['ts'][self.head:self.tail]
+        cut = int(np.searchsorted(live_ts, now_ns - self.window_ns, side='left'))
+        if cut:
+            self.signature_set.difference_update(self.entries['sig'][self.head:self.head + cut].tolist())
+            self.head += cut
+
+    def _make_room(self, count):
+        # Ensure count free slots after tail (caller holds self.lock)
+        if self.tail + count <= len(self.entries):
+            return
+        live = self.tail - self.head
+        if live + count > len(self.entries) // 2:
+            new_capacity = len(self.entries) * 2
+            while live + count > new_capacity // 2:
+                new_capacity *= 2
+            entries = np.empty(new_capacity, dtype=self.entries.dtype)
+        else:
+            entries = self.entries
+        entries[:live] = self.entries[self.head:self.tail]
+        self.entries, self.head, self.tail = entries, 0, live
+
+    def is_duplicate(self, event, now_ns=None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        signature = EventDeduplicator._generate_signature(event)
+        with self.lock:
+            self._expire(now_ns)
             if signature in self.signature_set:
                 return True
-            
-            # Add new signature
-            self.signatures.append((current_time, signature))
+            self._make_room(1)
+            self.entries[self.tail] = (now_ns, signature)
+            self.tail += 1
             self.signature_set.add(signature)
             return False
 
+    def is_duplicate_batch(self, events, now_ns=None):
+        """Vectorized check of a burst of events; returns a bool array aligned with events."""
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        signatures = np.array(EventDeduplicator._generate_signatures(events), dtype=np.uint64)
+        # Only the first occurrence of a signature within the batch can be new
+        duplicate = np.ones(len(signatures), dtype=bool)
+        _, first_index = np.unique(signatures, return_index=True)
+        duplicate[first_index] = False
+        with self.lock:
+            self._expire(now_ns)
+            # Hashed membership in the live set; np.isin would re-sort the whole window per batch
+            live = self.signature_set
+            duplicate |= np.fromiter((signature in live for signature in signatures.tolist()), dtype=bool, count=len(signatures))
+            new_signatures = signatures[~duplicate]
+            count = len(new_signatures)
+            if count:
+                self._make_room(count)
+                self.entries['ts'][self.tail:self.tail + count] = now_ns
+                self.entries['sig'][self.tail:self.tail + count] = new_signatures
+                self.tail += count
+                self.signature_set.update(new_signatures.tolist())
+        return duplicate
+
+class ShardedEventDeduplicator:
+    """Spreads signatures over independent EventDeduplicator shards, each with its own lock.
+
+    A signature always maps to the same shard, so duplicates are still caught while
+    producers hashing to different shards no longer contend on one lock.
+    """
+    def __init__(self, window_seconds=60, num_shards=None):
+        # Power of two so the shard is picked with a mask
+        num_shards = num_shards or os.cpu_count() or 1
+        self.num_shards = 1 << (num_shards - 1).bit_length()
+        self._mask = self.num_shards - 1
+        self.shards = [EventDeduplicator(window_seconds) for _ in range(self.num_shards)]
+
+    def is_duplicate(self, event, now_ns=None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        signature = EventDeduplicator._generate_signature(event)
+        return self.shards[signature & self._mask]._check_signature(signature, now_ns)
+
+class PerSymbolEventDeduplicator:
+    """One EventDeduplicator per symbol, keyed by the raw (price, timestamp) tuple.
+
+    Events of different symbols never collide, so within a symbol the fields
+    themselves are the signature and no hash function runs at all; each symbol
+    also gets its own lock.
+    """
+    def __init__(self, window_seconds=60):
+        self.window_seconds = window_seconds
+        self.per_symbol = {}
+        self._create_lock = threading.Lock()
+
+    def _shard(self, symbol):
+        shard = self.per_symbol.get(symbol)
+        if shard is None:
+            # Rare path: first event of a symbol, make sure only one shard is ever created
+            with self._create_lock:
+                shard = self.per_symbol.setdefault(symbol, EventDeduplicator(self.window_seconds))
+        return shard
+
+    def is_duplicate(self, event, now_ns=None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return self._shard(event.symbol)._check_signature((event.price, event.timestamp), now_ns)
+
+def _blocked_bloom_fpr(num_blocks, n, k):
+    # False positive rate of a 512-bit blocked Bloom filter: per-block loads are
+    # ~Poisson(n / num_blocks) and overloaded blocks dominate, so average the
+    # classic per-block rate over that distribution
+    load = n / num_blocks
+    spread = 10 * math.sqrt(load) + 10
+    fpr = 0.0
+    for i in range(max(0, int(load - spread)), int(load + spread) + 1):
+        p_load = math.exp(i * math.log(load) - load - math.lgamma(i + 1))
+        fpr += p_load * (1 - (1 - 1 / 512) ** (k * i)) ** k
+    return fpr
+
+class BloomEventDeduplicator:
+    """Approximate deduplicator backed by a jumping window of Bloom filter slots.
+
+    Memory is fixed by capacity and error_rate instead of growing with the event
+    rate; the price is that a new event is reported as a duplicate with
+    probability ~error_rate. Time is bucketed into integer ticks of
+    window_seconds / num_slots; each tick owns one slot in a ring of
+    num_slots + 1, inserts go to the current tick's slot and lookups check all
+    of them. Expiry is clearing the slots of the ticks that passed, with no
+    per-entry timestamp compares; the extra slot keeps an event for between
+    num_slots and num_slots + 1 ticks, so never less than window_seconds.
+
+    Each slot is a list of 512-bit blocks held as Python ints; a signature
+    picks one block and all k probes land inside it, folded into a single
+    mask, so a lookup is one AND-compare per slot with no numpy dispatch.
+    """
+    def __init__(self, window_seconds=60, capacity=1_000_000, error_rate=0.001, num_slots=8):
+        self.window_seconds = window_seconds
+        self.num_slots = num_slots
+        self.ring_size = num_slots + 1
+        self.tick_ns = max(1, int(window_seconds * 1_000_000_000) // num_slots)
+        # A lookup ORs ring_size filters, so size each for its share of events and error
+        slot_capacity = max(1, capacity // num_slots)
+        slot_error = error_rate / self.ring_size
+        # Start from the classic (unblocked) size, then grow until the blocked rate meets the target
+        num_bits = int(-slot_capacity * math.log(slot_error) / (math.log(2) ** 2))
+        self.num_blocks = max(1, (num_bits + 511) // 512)
+        while True:
+            self.num_hashes = max(1, round(0.693 * self.num_blocks * 512 / slot_capacity))
+            if _blocked_bloom_fpr(self.num_blocks, slot_capacity, self.num_hashes) <= slot_error:
+                break
+            self.num_blocks += max(1, self.num_blocks // 32)
+        self.num_bits = self.num_blocks * 512
+        # Up to 7 x 9-bit fields per 64-bit splitmix draw: bit offsets of the fields used from each draw
+        self._draw_shifts = [tuple(range(0, 9 * min(7, self.num_hashes - first), 9))
+                             for first in range(0, self.num_hashes, 7)]
+        self.slots = [[0] * self.num_blocks for _ in range(self.ring_size)]
+        self.last_tick = time.monotonic_ns() // self.tick_ns
+        self.lock = threading.Lock()
+
+    def _probes(self, signature):
+        # High 32 bits pick the block; 9-bit fields of splitmix64 outputs seeded by the
+        # signature pick k bits inside it (double hashing mod 512 correlates probes and
+        # inflates the rate). Plain int arithmetic: numpy scalar ops cost more per event
+        block = (signature >> 32) % self.num_blocks
+        mask = 0
+        x = signature
+        for shifts in self._draw_shifts:
+            x = (x + 0x9E3779B97F4A7C15) & _MASK64
+            z = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+            z ^= z >> 31
+            for shift in shifts:
+                mask |= 1 << (z >> shift & 511)
+        return block, mask
+
+    def _batch_probes(self, signatures):
+        # Vectorized _probes: same draws on uint64 arrays, bits packed into one mask per row
+        x = np.array(signatures, dtype=np.uint64)
+        count = len(x)
+        blocks = (x >> np.uint64(32)) % np.uint64(self.num_blocks)
+        positions = np.empty((count, self.num_hashes), dtype=np.intp)
+        column = 0
+        while column < self.num_hashes:
+            x += np.uint64(0x9E3779B97F4A7C15)
+            z = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            z ^= z >> np.uint64(31)
+            for _ in range(min(7, self.num_hashes - column)):
+                positions[:, column] = z & np.uint64(511)
+                z >>= np.uint64(9)
+                column += 1
+        bits = np.zeros((count, 512), dtype=bool)
+        bits[np.arange(count)[:, None], positions] = True
+        packed = np.packbits(bits, axis=1, bitorder='little')
+        return blocks.tolist(), [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+    def _advance(self, now_ns):
+        # Clear the slots of every tick since the last call (caller holds self.lock)
+        tick = now_ns // self.tick_ns
+        if tick <= self.last_tick:
+            return  # Stale clock readings (read before the lock, or shared by callers) never move time back
+        if tick - self.last_tick >= self.ring_size:
+            self.slots = [[0] * self.num_blocks for _ in range(self.ring_size)]  # Whole ring is stale
+        else:
+            for t in range(self.last_tick + 1, tick + 1):
+                self.slots[t % self.ring_size] = [0] * self.num_blocks
+        self.last_tick = tick
+
+    def _check(self, block, mask):
+        # Look the block up in every slot, inserting into the current one if new (caller holds self.lock)
+        for slot in self.slots:
+            if (slot[block] & mask) == mask:
+                return True
+        self.slots[self.last_tick % self.ring_size][block] |= mask
+        return False
+
+    def is_duplicate(self, event, now_ns=None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        block, mask = self._probes(EventDeduplicator._generate_signature(event))
+        with self.lock:
+            self._advance(now_ns)
+            return self._check(block, mask)
+
+    def is_duplicate_batch(self, events, now_ns=None):
+        """Check a burst of events: hashing and probe generation are vectorized, then one lock."""
+        blocks, masks = self._batch_probes(EventDeduplicator._generate_signatures(events))
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        with self.lock:
+            self._advance(now_ns)
+            check = self._check
+            return [check(block, mask) for block, mask in zip(blocks, masks)]
+
+class StableBloomEventDeduplicator:
+    """Approximate deduplicator backed by a Stable Bloom filter (Deng & Rafiei).
+
+    Cells are small counters instead of bits. Every insert decrements
+    `decrements` random cells, then sets the event's k cells to max_value, so old
+    events fade out at a rate set by the stream itself and the fraction of
+    nonzero cells settles at a constant: memory and false positive rate stay
+    bounded however many events arrive. There is no wall-clock window; an event
+    survives roughly max_value * num_cells / decrements inserts.
+
+    Decrements are drawn and applied in one vectorized step every decay_block
+    inserts rather than per insert; this only reorders decay within a block, so
+    the steady state is the same, and the per-event path is plain bytearray
+    indexing.
+    """
+    def __init__(self, num_cells=1 << 22, num_hashes=3, max_value=3, decrements=50, seed=None, decay_block=128):
+        # Defaults settle at ~16% nonzero cells (FPR ~0.4%) and keep an event for ~250k inserts
+        self.num_cells = num_cells
+        self.num_hashes = num_hashes
+        self.max_value = max_value
+        self.decrements = decrements
+        self.decay_block = decay_block
+        self.cells = bytearray(num_cells)
+        self._cell_view = np.frombuffer(self.cells, dtype=np.uint8)  # Shares memory with cells
+        self._pending = 0  # Inserts whose decrements have not been applied yet
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+
+    def _probes(self, signature):
+        # Double hashing on the two 32-bit halves of the signature
+        h1 = signature & 0xFFFFFFFF
+        h2 = (signature >> 32) | 1
+        num_cells = self.num_cells
+        return [(h1 + i * h2) % num_cells for i in range(self.num_hashes)]
+
+    def _decay(self):
+        # Apply the pending inserts' decrements in one go, saturating at zero (caller holds self.lock)
+        victims = self.rng.integers(self.num_cells, size=self.decrements * self._pending)
+        victims, hits = np.unique(victims, return_counts=True)
+        view = self._cell_view
+        view[victims] = np.maximum(view[victims] - hits, 0)
+        self._pending = 0
+
+    def is_duplicate(self, event, now_ns=None):
+        """now_ns is accepted for interface parity with the windowed deduplicators and ignored."""
+        positions = self._probes(EventDeduplicator._generate_signature(event))
+        with self.lock:
+            cells = self.cells
+            duplicate = all(cells[position] for position in positions)
+            # Decay, then refresh this event
+            self._pending += 1
+            if self._pending >= self.decay_block:
+                self._decay()
+            max_value = self.max_value
+            for position in positions:
+                cells[position] = max_value
+            return duplicate
+
 # Example usage
 if __name__ == "__main__":
     deduplicator = EventDeduplicator(window_seconds=1)
-    event1 = {"symbol": "AAPL", "price": 150.0, "timestamp": 1000}
-    event2 = {"symbol": "AAPL", "price": 150.0, "timestamp": 1000}
-    event3 = {"symbol": "GOOG", "price": 2800.0, "timestamp": 1001}
+    event1 = Event.from_dict({"symbol": "AAPL", "price": 150.0, "timestamp": 1000})
+    event2 = Event.from_dict({"symbol": "AAPL", "price": 150.0, "timestamp": 1000})
+    event3 = Event.from_dict({"symbol": "GOOG", "price": 2800.0, "timestamp": 1001})
 
     print(deduplicator.is_duplicate(event1))  # False
     print(deduplicator.is_duplicate(event2))  # True (duplicate)
     print(deduplicator.is_duplicate(event3))  # False
+    print(deduplicator.is_duplicate_fields("AAPL", 150.0, 1000))  # True (duplicate)
+    print(deduplicator.is_duplicate_dict({"symbol": "MSFT", "price": 410.0, "timestamp": 1002}))  # False
+    print(deduplicator.is_duplicate_batch([event1, event3, event2]))  # [True, True, True]
     time.sleep(1.5)  # Wait for window to expire
     print(deduplicator.is_duplicate(event1))  # False (window expired)
 
+    array_dedup = ArrayEventDeduplicator(window_seconds=1)
+    print(array_dedup.is_duplicate(event1))  # False
+    print(array_dedup.is_duplicate(event2))  # True (duplicate)
+    print(array_dedup.is_duplicate_batch([event1, event3, event3]))  # [ True False  True]
+
+    sharded = ShardedEventDeduplicator(window_seconds=1, num_shards=4)
+    print(sharded.is_duplicate(event1))  # False
+    print(sharded.is_duplicate(event2))  # True (duplicate)
+
+    per_symbol = PerSymbolEventDeduplicator(window_seconds=1)
+    print(per_symbol.is_duplicate(event1))  # False
+    print(per_symbol.is_duplicate(event2))  # True (duplicate)
+    print(per_symbol.is_duplicate(event3))  # False
+
+    if FastEventDeduplicator is not None:
+        fast = FastEventDeduplicator(1)
+        print(fast.is_duplicate("AAPL", 150.0, 1000))  # False
+        print(fast.is_duplicate("AAPL", 150.0, 1000))  # True (duplicate)
+
+    bloom = BloomEventDeduplicator(window_seconds=1, capacity=10_000)
+    print(bloom.is_duplicate(event1))  # False
+    print(bloom.is_duplicate(event2))  # True (duplicate)
+    print(bloom.is_duplicate_batch([event1, event3, event3]))  # [True, False, True]
+    time.sleep(1.5)  # Every slot's tick has passed
+    print(bloom.is_duplicate(event1))  # False (window expired)
+
+    stable = StableBloomEventDeduplicator(num_cells=10_000, seed=0)
+    print(stable.is_duplicate(event1))  # False
+    print(stable.is_duplicate(event2))  # True (duplicate)
+